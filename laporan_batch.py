@@ -0,0 +1,310 @@
+"""
+Laporan statis dashboard inovasi per Admin OPD Grouped dan per kabupaten/kota.
+
+Memakai fungsi pemuatan, filter, dan chart yang sama dengan dashboard, tanpa
+server Streamlit. Dataset dimuat sekali di proses utama lalu disimpan sebagai
+satu file Parquet sementara; setiap worker process pool membacanya sekali dan
+merender laporan HTML untuk banyak entitas.
+
+Contoh:
+    python laporan_batch.py --data data_inovasi.xlsx --keluar laporan/ --workers 8
+"""
+import argparse
+import hashlib
+import html
+import os
+import re
+import tempfile
+import time
+import unicodedata
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import streamlit.config
+import streamlit.logger
+from plotly.offline import get_plotlyjs
+
+# Tanpa server Streamlit, pemanggilan st.* di fungsi dashboard hanya memunculkan peringatan "bare mode".
+# Opsi config dipakai ulang saat config diparse; set_log_level untuk logger yang sudah dibuat.
+streamlit.config.set_option("logger.level", "error")
+streamlit.logger.set_log_level("error")
+warnings.filterwarnings("ignore", message="CartoDB tiles", category=UserWarning)
+
+import dashboard_inovasi_final_fix as dashboard  # noqa: E402
+
+MAX_WORKERS = int(os.environ.get("INOVASI_LAPORAN_WORKERS", str(os.cpu_count() or 1)))
+TABEL_MAX_ROWS = 500
+# kelompok laporan -> kolom entitas
+KELOMPOK = {'opd': 'Admin OPD Grouped', 'daerah': 'Daerah'}
+JUDUL_KELOMPOK = {'opd': 'Admin OPD', 'daerah': 'Kabupaten/Kota'}
+JUDUL_SECTION = {
+    'opd': '2) Analisis berdasarkan Kategori Admin OPD',
+    'bentuk': '3) Bentuk Inovasi',
+    'jenis': '4) Jenis Inovasi (Digital vs Non Digital)',
+    'urusan': '5) Urusan Pemerintahan Utama',
+}
+CSS = """
+body { font-family: system-ui, sans-serif; margin: 2rem auto; max-width: 1200px; color: #222; }
+h1 { margin-bottom: 0.2rem; } .sub { color: #666; margin-top: 0; }
+.metrik { display: flex; gap: 2rem; margin: 1rem 0; }
+.metrik div { background: #f3f6fa; padding: 0.8rem 1.2rem; border-radius: 6px; }
+.metrik b { display: block; font-size: 1.6rem; }
+table.tabel { border-collapse: collapse; font-size: 0.85rem; width: 100%; }
+table.tabel th, table.tabel td { border-bottom: 1px solid #ddd; padding: 4px 6px; text-align: left; vertical-align: top; }
+iframe.peta { width: 100%; height: 550px; border: 0; }
+"""
+
+# Data per worker (diisi oleh init_worker)
+_STATE = {}
+
+
+def siapkan_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Kolom tambahan yang di dashboard dibuat oleh main() dan section 5.5: kategori/nama pendek OPD dan Daerah."""
+    if 'Admin OPD' in df.columns:
+        df = df.assign(
+            **{
+                "Kategori Admin OPD": dashboard.opd_lookup(df['Admin OPD'], 'Kategori Admin OPD'),
+                "Nama Pendek OPD": dashboard.opd_lookup(df['Admin OPD'], 'Nama Pendek OPD')
+            }
+        )
+    lat_col, lon_col = dashboard.lat_lon_columns(df)
+    daerah = pd.Series(None, index=df.index, dtype=object)
+    if lat_col and lon_col:
+        df_geo = df.dropna(subset=[lat_col, lon_col])
+        if not df_geo.empty:
+            df_geo = dashboard.map_coordinates_to_region(df_geo, dashboard.load_map_data(), lat_col, lon_col)
+            daerah[df_geo.index] = df_geo['Daerah']
+    return df.assign(Daerah=daerah)
+
+
+def nama_file(kelompok: str, nama: str, terpakai: set) -> str:
+    """Nama file aman (ASCII, huruf kecil); nama yang bentrok diberi nomor urut."""
+    slug = unicodedata.normalize('NFKD', nama).encode('ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^0-9a-z]+', '-', slug.lower()).strip('-')[:80] or 'tanpa-nama'
+    kandidat, i = f"{kelompok}-{slug}.html", 2
+    while kandidat in terpakai:
+        kandidat, i = f"{kelompok}-{slug}-{i}.html", i + 1
+    terpakai.add(kandidat)
+    return kandidat
+
+
+def daftar_tugas(
+    df: pd.DataFrame,
+    kelompok: List[str],
+    keluar: Path,
+    min_kematangan: int,
+    plotlyjs: str
+) -> list:
+    """Satu tugas per entitas: (kelompok, nama, path keluaran, ambang kematangan, total baris, mode plotly.js)."""
+    tugas, terpakai = [], set()
+    for k in kelompok:
+        col = KELOMPOK[k]
+        if col not in df.columns:
+            print(f"Kolom '{col}' tidak ada; laporan {k} dilewati.")
+            continue
+        for nama in sorted(df[col].dropna().astype(str).unique()):
+            path = keluar / nama_file(k, nama, terpakai)
+            tugas.append((k, nama, str(path), min_kematangan, len(df), plotlyjs))
+    return tugas
+
+
+def init_worker(path: str) -> None:
+    """Memuat dataset bersama dan indeks filternya sekali per worker."""
+    df = pd.read_parquet(path)
+    index = dashboard.make_filter_index(df)
+    index['bitmaps']['Daerah'] = dashboard.build_bitmap_index(df['Daerah'])
+    _STATE.update(df=df, index=index)
+
+
+def figure_html(fig, plotlyjs) -> str:
+    return fig.to_html(full_html=False, include_plotlyjs=plotlyjs)
+
+
+def peta_html(m) -> str:
+    """Peta folium sebagai iframe srcdoc agar laporan tetap satu file HTML."""
+    return f'<iframe class="peta" srcdoc="{html.escape(m.get_root().render())}"></iframe>'
+
+
+def render_laporan(kelompok: str, nama: str, df: pd.DataFrame, total: int, plotlyjs: str) -> str:
+    """HTML lengkap satu laporan: ringkasan, chart section 2–5, wilayah & peta, Gantt, dan tabel."""
+    figs = []  # (judul section atau None, html)
+
+    # plotly.js hanya disertakan pada figure pertama
+    def tambah_figure(judul: Optional[str], fig) -> None:
+        figs.append((judul, figure_html(fig, plotlyjs if not figs else False)))
+
+    # 2–5) Chart dari agregat kubus entitas ini (builder sama dengan dashboard)
+    agregat = dashboard.cube_aggregates(dashboard.make_count_cube(df))
+    judul_terakhir = None
+    for section, chart, kunci, build in dashboard.SECTION_FIGURES:
+        if kunci in agregat and not agregat[kunci].empty:
+            judul = JUDUL_SECTION[section] if section != judul_terakhir else None
+            tambah_figure(judul, build(agregat[kunci]))
+            judul_terakhir = section
+
+    # 5.5) Wilayah
+    df_geo = df.dropna(subset=['Daerah'])
+    if not df_geo.empty:
+        if kelompok == 'daerah' and 'Jenis' in df_geo.columns:
+            tambah_figure('5.5) Wilayah', dashboard.fig_jenis_daerah(df_geo, nama))
+        else:
+            daerah_counts = dashboard.counts_table(dashboard.count_values(df_geo['Daerah']), 'Daerah')
+            tambah_figure('5.5) Wilayah', dashboard.fig_counts_bar(daerah_counts, 'Daerah', 'Jumlah Inovasi per Daerah'))
+
+    # 7) Timeline & Gantt (mode agregat bulanan untuk entitas besar, sama seperti dashboard)
+    if 'Tanggal Input' in df.columns:
+        gantt_plot_df = dashboard.gantt_frame(df)
+        if not gantt_plot_df.empty:
+            color = next((c for c in dashboard.GANTT_COLOR_OPTIONS if c in gantt_plot_df.columns), None)
+            if len(gantt_plot_df) > dashboard.GANTT_MAX_TASKS:
+                fig = dashboard.fig_gantt_agregat(gantt_plot_df, color, 'Bulan')
+            else:
+                fig = dashboard.fig_gantt_tugas(gantt_plot_df, color)
+            tambah_figure('7) Timeline & Gantt', fig)
+
+    lat_col, lon_col = dashboard.lat_lon_columns(df)
+    peta = ''
+    if lat_col and lon_col:
+        map_df = df.dropna(subset=[lat_col, lon_col])
+        if not map_df.empty:
+            if kelompok == 'daerah' or not {'lat', 'lon'}.issubset(map_df.columns):
+                m = dashboard.build_region_map(map_df, lat_col, lon_col)
+            else:
+                m = dashboard.build_innovation_map(map_df, daerah_col='Daerah')
+            peta = f"<h2>Peta Lokasi Inovasi</h2>{peta_html(m)}"
+
+    kematangan = df['Kematangan'].mean() if 'Kematangan' in df.columns else float('nan')
+    persen = len(df) / total * 100 if total else 0
+    tabel = dashboard.export_frame(df.head(TABEL_MAX_ROWS)).to_html(
+        index=False, na_rep='', border=0, classes='tabel'
+    )
+    isi = "\n".join(
+        (f"<h2>{html.escape(judul)}</h2>" if judul else "") + fig_html for judul, fig_html in figs
+    )
+    return f"""<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8">
+<title>Laporan Inovasi — {html.escape(nama)}</title>
+<style>{CSS}</style></head><body>
+<h1>📊 {html.escape(nama)}</h1>
+<p class="sub">{JUDUL_KELOMPOK[kelompok]} · dibuat {datetime.now():%Y-%m-%d %H:%M}</p>
+<div class="metrik">
+<div>Jumlah inovasi<b>{len(df)}</b></div>
+<div>Dari total<b>{persen:.1f}%</b></div>
+<div>Rata-rata kematangan<b>{kematangan:.2f}</b></div>
+</div>
+{isi}
+{peta}
+<h2>Tabel Inovasi</h2>
+<p>{min(len(df), TABEL_MAX_ROWS)} dari {len(df)} baris.</p>
+{tabel}
+</body></html>
+"""
+
+
+def render_tugas(tugas: tuple) -> Tuple[str, str, str, int]:
+    kelompok, nama, path, min_kematangan, total, plotlyjs = tugas
+    rows = dashboard.filter_rows(_STATE['index'], min_kematangan, {KELOMPOK[kelompok]: [nama]})
+    df = _STATE['df'].take(rows)
+    Path(path).write_text(render_laporan(kelompok, nama, df, total, plotlyjs), encoding='utf-8')
+    return kelompok, nama, path, len(df)
+
+
+def jalankan(path: str, tugas: list, max_workers: int = MAX_WORKERS) -> list:
+    """Render semua tugas paralel; jatuh ke render berurutan jika process pool tidak tersedia."""
+    if len(tugas) <= 1 or max_workers <= 1:
+        init_worker(path)
+        return [render_tugas(t) for t in tugas]
+    workers = min(max_workers, len(tugas))
+    try:
+        # "spawn": worker tidak mewarisi thread pool pyarrow/BLAS dari proses utama
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn"),
+            initializer=init_worker, initargs=(path,)
+        ) as pool:
+            return list(pool.map(render_tugas, tugas, chunksize=max(1, len(tugas) // (workers * 4))))
+    except (BrokenProcessPool, OSError):
+        init_worker(path)
+        return [render_tugas(t) for t in tugas]
+
+
+def tulis_indeks(keluar: Path, hasil: list) -> Path:
+    """index.html berisi tautan ke semua laporan, dikelompokkan per jenis entitas."""
+    bagian = []
+    for kelompok, judul in JUDUL_KELOMPOK.items():
+        baris = [
+            f'<tr><td><a href="{html.escape(Path(path).name)}">{html.escape(nama)}</a></td><td>{n}</td></tr>'
+            for k, nama, path, n in hasil if k == kelompok
+        ]
+        if baris:
+            bagian.append(
+                f"<h2>{judul} ({len(baris)})</h2><table class=\"tabel\">"
+                f"<tr><th>{judul}</th><th>Jumlah inovasi</th></tr>{''.join(baris)}</table>"
+            )
+    path = keluar / "index.html"
+    path.write_text(
+        f"<!DOCTYPE html><html lang=\"id\"><head><meta charset=\"utf-8\"><title>Laporan Inovasi</title>"
+        f"<style>{CSS}</style></head><body><h1>📊 Laporan Inovasi Daerah</h1>"
+        f"<p class=\"sub\">dibuat {datetime.now():%Y-%m-%d %H:%M}</p>{''.join(bagian)}</body></html>",
+        encoding='utf-8'
+    )
+    return path
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render laporan HTML dashboard inovasi per OPD dan per daerah.")
+    parser.add_argument("--data", default=dashboard.DEFAULT_DATA_PATH, help="file Excel sumber")
+    parser.add_argument("--keluar", default="laporan", help="folder keluaran (default: laporan)")
+    parser.add_argument("--kelompok", choices=["opd", "daerah", "semua"], default="semua")
+    parser.add_argument("--min-kematangan", type=int, default=0, help="ambang kematangan minimal")
+    parser.add_argument(
+        "--gabung-mirip", action="store_true",
+        help="gabungkan inovasi yang hampir sama (seperti checkbox di sidebar)"
+    )
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="jumlah worker process")
+    parser.add_argument(
+        "--plotlyjs", choices=["directory", "cdn", "inline"], default="directory",
+        help="directory: satu plotly.min.js dipakai bersama; cdn: dari internet; inline: disisipkan di tiap file"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    mulai = time.perf_counter()
+
+    raw = Path(args.data).read_bytes()
+    data_hash = hashlib.sha256(raw).hexdigest()
+    df = dashboard.load_data(data_hash, lambda: raw)
+    if df.empty:
+        print(f"Data kosong atau tidak terbaca: {args.data}")
+        return 1
+    if args.gabung_mirip:
+        df = dashboard.collapse_near_duplicates(df, dashboard.near_duplicate_clusters(df))
+    df = siapkan_data(df)
+
+    keluar = Path(args.keluar)
+    keluar.mkdir(parents=True, exist_ok=True)
+    plotlyjs = True if args.plotlyjs == "inline" else args.plotlyjs
+    if args.plotlyjs == "directory":
+        (keluar / "plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+
+    kelompok = list(KELOMPOK) if args.kelompok == "semua" else [args.kelompok]
+    tugas = daftar_tugas(df, kelompok, keluar, args.min_kematangan, plotlyjs)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "dataset.parquet"
+        df.to_parquet(path, index=False)
+        hasil = jalankan(str(path), tugas, args.workers)
+
+    indeks = tulis_indeks(keluar, hasil)
+    print(f"{len(hasil)} laporan ditulis dalam {time.perf_counter() - mulai:.1f} detik. Indeks: {indeks}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
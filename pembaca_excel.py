@@ -0,0 +1,107 @@
+"""
+Pembaca workbook Excel multi-sheet untuk dashboard inovasi.
+
+Setiap sheet dibaca secara streaming (openpyxl mode read-only) dalam potongan
+baris berukuran tetap, sehingga memori puncak tidak bergantung pada ukuran
+sheet. Sheet-sheet diparse paralel di process pool, lalu digabung menjadi
+satu DataFrame. Modul ini terpisah dari skrip Streamlit agar worker
+process pool dapat meng-import-nya.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from multiprocessing import get_context
+from typing import List, Optional
+
+import pandas as pd
+from openpyxl import load_workbook
+
+CHUNK_ROWS = 5000
+MAX_WORKERS = int(os.environ.get("INOVASI_PEMBACA_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Sheet ikut digabung jika minimal separuh kolomnya sama dengan sheet data pertama
+MIN_KOLOM_SAMA = 0.5
+
+
+def sheet_names(raw: bytes) -> List[str]:
+    wb = load_workbook(BytesIO(raw), read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def column_names(header: tuple) -> List[str]:
+    """Nama kolom dari baris header; sel kosong menjadi 'Unnamed: i' seperti pd.read_excel."""
+    return [str(h).strip() if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+
+
+def read_sheet(raw: bytes, sheet: str, chunk_rows: int = CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Membaca satu sheet baris demi baris. Setiap `chunk_rows` baris diubah menjadi
+    DataFrame (kolumnar, jauh lebih hemat dari tuple Python) sebelum baris berikutnya dibaca.
+    Baris kosong dilewati; kolom tanpa header yang seluruhnya kosong dibuang.
+    """
+    wb = load_workbook(BytesIO(raw), read_only=True, data_only=True)
+    try:
+        ws = wb[sheet]
+        if wb.read_only:
+            # Mode read-only mempercayai tag <dimension> di XML sheet, yang bisa basi
+            # (mis. "A1" dari beberapa eksportir); hitung ulang seperti pd.read_excel
+            ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = column_names(header)
+        width = len(columns)
+
+        chunks, buffer = [], []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            buffer.append(row[:width] + (None,) * (width - len(row)))
+            if len(buffer) >= chunk_rows:
+                chunks.append(pd.DataFrame.from_records(buffer, columns=columns))
+                buffer = []
+        if buffer or not chunks:
+            chunks.append(pd.DataFrame.from_records(buffer, columns=columns))
+    finally:
+        wb.close()
+
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    tanpa_header = [c for c, h in zip(columns, header) if h is None and df[c].isna().all()]
+    df = df.drop(columns=tanpa_header).infer_objects()
+    # Kolom yang seluruhnya kosong menjadi float NaN (bukan object None), sama seperti pd.read_excel
+    kosong = [c for c in df.columns if df[c].dtype == object and df[c].isna().all()]
+    return df.astype({c: float for c in kosong})
+
+
+def read_sheets(raw: bytes, sheets: List[str], max_workers: int = MAX_WORKERS) -> List[pd.DataFrame]:
+    """Parse beberapa sheet paralel; jatuh ke pembacaan berurutan jika process pool tidak tersedia."""
+    if len(sheets) <= 1 or max_workers <= 1:
+        return [read_sheet(raw, s) for s in sheets]
+    try:
+        # "spawn": aman dipakai dari proses server Streamlit yang multi-thread
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(sheets)), mp_context=get_context("spawn")
+        ) as pool:
+            return list(pool.map(read_sheet, [raw] * len(sheets), sheets))
+    except (BrokenProcessPool, OSError):
+        return [read_sheet(raw, s) for s in sheets]
+
+
+def read_workbook(raw: bytes, sheets: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Membaca semua sheet data dalam workbook menjadi satu DataFrame. Sheet pertama
+    yang berisi data menentukan skema; sheet lain ikut digabung jika kolomnya cukup
+    mirip (sheet keterangan/rekap otomatis terlewati).
+    """
+    frames = [f for f in read_sheets(raw, sheets or sheet_names(raw)) if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    acuan = set(frames[0].columns)
+    frames = [f for f in frames if len(acuan & set(f.columns)) >= MIN_KOLOM_SAMA * len(acuan)]
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True).infer_objects()
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+import streamlit.config
+import streamlit.logger
+
+# Modul dashboard di-import tanpa server Streamlit; sembunyikan peringatan "bare mode"
+streamlit.config.set_option("logger.level", "error")
+streamlit.logger.set_log_level("error")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
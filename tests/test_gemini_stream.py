@@ -0,0 +1,124 @@
+"""Streaming paralel & cache jawaban Gemini terhadap server stub SSE lokal."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import dashboard_inovasi_final_fix as dashboard
+
+POTONGAN = ["Kolaborasi ", "sinergi ", "layanan."]
+JEDA = 0.2  # detik per potongan
+
+
+class StubGemini(BaseHTTPRequestHandler):
+    """Menjawab setiap POST dengan stream SSE bergaya generateContent, sambil mencatat konkurensi."""
+
+    aktif = 0
+    puncak = 0
+    permintaan = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        cls = type(self)
+        with cls.lock:
+            cls.permintaan += 1
+            cls.aktif += 1
+            cls.puncak = max(cls.puncak, cls.aktif)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for teks in POTONGAN:
+                data = {"candidates": [{"content": {"parts": [{"text": teks}], "role": "model"}, "index": 0}]}
+                self.wfile.write(f"data: {json.dumps(data)}\r\n\r\n".encode())
+                self.wfile.flush()
+                time.sleep(JEDA)
+        finally:
+            with cls.lock:
+                cls.aktif -= 1
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    StubGemini.aktif = StubGemini.puncak = StubGemini.permintaan = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGemini)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    monkeypatch.setenv("GEMINI_API_KEY", "kunci-uji")
+    monkeypatch.setenv("GEMINI_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(dashboard, "GEMINI_CACHE_PATH", tmp_path / "gemini_cache.sqlite")
+    dashboard.gemini_client.clear()
+    yield StubGemini
+    dashboard.gemini_client.clear()
+    server.shutdown()
+
+
+@pytest.fixture
+def konteks_df():
+    return pd.DataFrame({
+        "Judul Inovasi": ["A", "B", "C"],
+        "Urusan Utama": ["Kesehatan", "Pendidikan", "Perhubungan"],
+        "Bentuk Inovasi": ["Aplikasi", "Program", "Sistem"],
+        "Deskripsi": ["a", "b", "c"],
+    })
+
+
+def test_streaming_paralel(stub, konteks_df):
+    kombinasi = [("A", "B"), ("A", "C"), ("B", "C")]
+    update = []
+
+    mulai = time.perf_counter()
+    hasil = dashboard.saran_kolaborasi_paralel(
+        kombinasi, konteks_df, on_update=lambda i, teks: update.append((i, teks)), max_workers=3
+    )
+    durasi = time.perf_counter() - mulai
+
+    assert hasil == ["".join(POTONGAN)] * 3
+    assert stub.permintaan == 3
+    assert stub.puncak == 3
+    # Tiga stream berjalan bersamaan: jauh di bawah total waktu bila berurutan
+    assert durasi < 3 * len(POTONGAN) * JEDA
+    # Teks dialirkan bertahap per kombinasi, bukan sekali di akhir
+    assert [teks for i, teks in update if i == 0] == ["Kolaborasi ", "Kolaborasi sinergi ", "".join(POTONGAN)]
+
+
+def test_cache_hit_tanpa_permintaan_baru(stub, konteks_df):
+    pasangan = ("A", "B")
+    assert dashboard.saran_tersimpan(pasangan, konteks_df) is None
+
+    assert "".join(dashboard.stream_saran_kolaborasi(pasangan, konteks_df)) == "".join(POTONGAN)
+    assert stub.permintaan == 1
+
+    tersimpan = dashboard.saran_tersimpan(pasangan, konteks_df)
+    assert tersimpan is not None and tersimpan[0] == "".join(POTONGAN)
+    assert dashboard.saran_kolaborasi_gemini(pasangan, konteks_df) == "".join(POTONGAN)
+    assert stub.permintaan == 1
+
+
+class Rerun(Exception):
+    """Pengganti exception rerun Streamlit yang dilempar dari elemen UI."""
+
+
+def test_interupsi_membatalkan_sisa_permintaan(stub, konteks_df):
+    kombinasi = [("A", "B"), ("A", "C"), ("B", "C"), ("A", "B", "C")]
+
+    def on_update(i, teks):
+        raise Rerun()
+
+    mulai = time.perf_counter()
+    with pytest.raises(Rerun):
+        dashboard.saran_kolaborasi_paralel(kombinasi, konteks_df, on_update=on_update, max_workers=1)
+    # Kembali segera setelah potongan pertama, tanpa menunggu kombinasi lain
+    assert time.perf_counter() - mulai < 2 * JEDA
+
+    time.sleep(len(POTONGAN) * JEDA + 0.2)
+    # Kombinasi yang masih antre dibatalkan; jawaban terpotong tidak disimpan
+    assert stub.permintaan == 1
+    assert dashboard.saran_tersimpan(kombinasi[0], konteks_df) is None
@@ -0,0 +1,175 @@
+"""Ingest inkremental dan kubus agregat dibandingkan dengan perhitungan penuh."""
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dashboard_inovasi_final_fix as dashboard
+
+OPD = [
+    "Dinas Kesehatan (Jatimprov. Dinkes)",
+    "Bappeda (Iga2024.bappeda.jatim)",
+    "SMK",
+    "RSUD Dr. Soetomo",
+    "admin.jawa.timur",
+]
+BENTUK = ["Sistem", "Program", "Aplikasi", "Metode"]
+URUSAN = ["Kesehatan", "Pendidikan", "Perhubungan", "Ekonomi"]
+
+
+def data_mentah(n: int, seed: int, awal: int = 0) -> pd.DataFrame:
+    """Baris mentah berbentuk sama dengan sheet data inovasi."""
+    rng = np.random.default_rng(seed)
+    tanggal = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 700, n), unit="D")
+    return pd.DataFrame({
+        "Judul Inovasi": [f"Inovasi {awal + i}" for i in range(n)],
+        "Admin OPD": rng.choice(OPD, n),
+        "Jenis": rng.choice(["Digital", "Non Digital"], n),
+        "Bentuk Inovasi": rng.choice(BENTUK, n),
+        "Kematangan": rng.integers(0, 100, n),
+        "Urusan Utama": rng.choice(URUSAN, n),
+        "Kategori Admin OPD": rng.choice(["Provinsi", "Kabupaten/Kota"], n),
+        "Tanggal Input": tanggal.strftime("%d/%m/%Y"),
+        "Koordinat": [f"{-7 - a:.6f},{112 + b:.6f}" for a, b in rng.random((n, 2))],
+        "Deskripsi": [f"Deskripsi inovasi {awal + i}" for i in range(n)],
+    })
+
+
+def muat(data_hash: str, df_mentah: pd.DataFrame, kategorikal: bool) -> pd.DataFrame:
+    buf = BytesIO()
+    df_mentah.to_excel(buf, index=False)
+    raw = buf.getvalue()
+    return dashboard.load_data(data_hash, lambda: raw, kategorikal)
+
+
+def kubus_terurut(cube: pd.DataFrame) -> pd.DataFrame:
+    """Kubus dengan dimensi sebagai teks dan urutan sel tetap, agar bisa dibandingkan langsung."""
+    dims = [c for c in cube.columns if c != "Jumlah"]
+    return cube.astype({d: str for d in dims}).sort_values(dims).reset_index(drop=True)
+
+
+@pytest.fixture
+def dibersihkan(monkeypatch, tmp_path):
+    """Cache dataset di tmp_path; mencatat jumlah baris setiap panggilan prepare_rows."""
+    monkeypatch.setattr(dashboard, "DATA_CACHE_DIR", tmp_path / "inkremental")
+    dashboard.load_data.clear()
+    catatan = []
+    prepare_rows = dashboard.prepare_rows
+
+    def prepare_rows_dicatat(df):
+        catatan.append(len(df))
+        return prepare_rows(df)
+
+    monkeypatch.setattr(dashboard, "prepare_rows", prepare_rows_dicatat)
+    yield catatan
+    dashboard.load_data.clear()
+
+
+def muat_penuh(monkeypatch, tmp_path, df_mentah: pd.DataFrame, kategorikal: bool) -> pd.DataFrame:
+    """Ingest yang sama tanpa basis (direktori cache kosong)."""
+    monkeypatch.setattr(dashboard, "DATA_CACHE_DIR", tmp_path / "penuh")
+    return muat("penuh", df_mentah, kategorikal)
+
+
+@pytest.mark.parametrize("kategorikal", [True, False])
+def test_inkremental_sama_dengan_muat_penuh(dibersihkan, monkeypatch, tmp_path, kategorikal):
+    basis = data_mentah(600, seed=0)
+    df_basis = muat("basis", basis, kategorikal)
+    dashboard.write_store(
+        dashboard.make_count_cube(df_basis), dashboard.dataset_key("basis", kategorikal), ".kubus.parquet"
+    )
+
+    # Selisih: 60 baris dihapus, 45 diubah (termasuk nilai kategori baru), 50 ditambahkan
+    rng = np.random.default_rng(1)
+    hapus = rng.choice(len(basis), 60, replace=False)
+    ubah = rng.choice(np.setdiff1d(np.arange(len(basis)), hapus), 45, replace=False)
+    baru = basis.copy()
+    baru.loc[ubah, "Kematangan"] = (baru.loc[ubah, "Kematangan"] + 1) % 100
+    baru.loc[ubah[:10], "Bentuk Inovasi"] = "Gerakan"
+    baru = pd.concat([baru.drop(index=hapus), data_mentah(50, seed=2, awal=len(basis))], ignore_index=True)
+
+    dibersihkan.clear()
+    df_inkremental = muat("selisih", baru, kategorikal)
+    assert dibersihkan == [45 + 50]
+    kubus_inkremental = dashboard.read_store(dashboard.dataset_key("selisih", kategorikal), ".kubus.parquet")
+    assert kubus_inkremental is not None
+
+    dibersihkan.clear()
+    df_penuh = muat_penuh(monkeypatch, tmp_path, baru, kategorikal)
+    assert dibersihkan == [len(baru)]
+
+    pd.testing.assert_frame_equal(df_inkremental, df_penuh)
+    pd.testing.assert_frame_equal(
+        kubus_terurut(kubus_inkremental), kubus_terurut(dashboard.make_count_cube(df_penuh))
+    )
+
+
+def test_dtype_berubah_jatuh_ke_muat_penuh(dibersihkan, monkeypatch, tmp_path):
+    # Satu teks di kolom Kematangan membuat kolom basis float (NaN) setelah dibersihkan,
+    # sedangkan baris baru yang semuanya angka menjadi int -> skema tidak cocok
+    basis = data_mentah(300, seed=3).astype({"Kematangan": object})
+    basis.loc[0, "Kematangan"] = "belum dinilai"
+    muat("basis", basis, True)
+
+    baru = pd.concat([basis, data_mentah(50, seed=4, awal=len(basis))], ignore_index=True)
+    dibersihkan.clear()
+    df_inkremental = muat("selisih", baru, True)
+    # Percobaan inkremental atas 50 baris baru ditolak, lalu seluruh baris dibersihkan ulang
+    assert dibersihkan == [50, len(baru)]
+    assert dashboard.read_store(dashboard.dataset_key("selisih", True), ".kubus.parquet") is None
+
+    df_penuh = muat_penuh(monkeypatch, tmp_path, baru, True)
+    pd.testing.assert_frame_equal(df_inkremental, df_penuh)
+    assert df_inkremental["Kematangan"].dtype == float
+
+
+def hitung_dari_baris(df: pd.DataFrame) -> dict:
+    """Agregat section 2–5 yang dihitung langsung dari baris hasil filter (value_counts)."""
+    def sebagai_dict(counts):
+        return {k: int(v) for k, v in counts.items() if v > 0}
+
+    bulan = df["Tanggal Input"].dt.to_period("M").dt.to_timestamp()
+    return {
+        "opd": sebagai_dict(dashboard.opd_lookup(df["Admin OPD"], "Nama Pendek OPD").astype(str).value_counts()),
+        "bentuk": sebagai_dict(df["Bentuk Inovasi"].astype(str).value_counts()),
+        "jenis": sebagai_dict(df["Jenis"].astype(str).value_counts()),
+        "urusan": sebagai_dict(df["Urusan Utama"].astype(str).value_counts()),
+        "tren_jenis": sebagai_dict(df.groupby([bulan, df["Jenis"].astype(str)]).size()),
+    }
+
+
+def hitung_dari_kubus(agregat: dict) -> dict:
+    hasil = {
+        kunci: dict(zip(agregat[kunci].iloc[:, 0].astype(str), agregat[kunci]["Jumlah"]))
+        for kunci in ["opd", "bentuk", "jenis", "urusan"]
+    }
+    tren = agregat["tren_jenis"]
+    hasil["tren_jenis"] = {(b, str(j)): c for b, j, c in tren.itertuples(index=False) if c > 0}
+    return hasil
+
+
+@pytest.mark.parametrize("kategorikal", [True, False])
+def test_kubus_sama_dengan_value_counts(kategorikal):
+    mentah = data_mentah(800, seed=5).astype({"Kematangan": float})
+    mentah.loc[::37, "Kematangan"] = np.nan
+    df = dashboard.finalize_rows(dashboard.prepare_rows(mentah), kategorikal)
+    index = dashboard.make_filter_index(df)
+    cube = dashboard.make_count_cube(df)
+
+    rng = np.random.default_rng(6)
+    for _ in range(60):
+        pilihan = {}
+        for col in ["Jenis", "Admin OPD Grouped", "Kategori Admin OPD", "Urusan Utama"]:
+            nilai = sorted(df[col].dropna().astype(str).unique())
+            pilihan[col] = list(rng.choice(nilai, rng.integers(0, min(3, len(nilai)) + 1), replace=False))
+            if rng.random() < 0.1:
+                pilihan[col].append("All")
+        min_kematangan = int(rng.choice([0, 0, 10, 33, 50, 99, 100]))
+
+        harapan = hitung_dari_baris(df.take(dashboard.filter_rows(index, min_kematangan, pilihan)))
+        agregat = dashboard.cube_aggregates(dashboard.slice_cube(cube, min_kematangan, pilihan))
+
+        assert hitung_dari_kubus(agregat) == harapan, (pilihan, min_kematangan)
+        for kunci in ["opd", "bentuk", "jenis", "urusan"]:
+            assert agregat[kunci]["Jumlah"].is_monotonic_decreasing
@@ -0,0 +1,43 @@
+"""Klaster near-duplicate: judul berbeda dengan deskripsi boilerplate yang sama tidak boleh digabung."""
+import numpy as np
+import pandas as pd
+
+import dashboard_inovasi_final_fix as dashboard
+
+BOILERPLATE = (
+    "Inovasi ini merupakan upaya Dinas Kesehatan untuk meningkatkan kualitas pelayanan publik "
+    "melalui pemanfaatan teknologi informasi, penyederhanaan prosedur, dan kolaborasi lintas sektor "
+    "sehingga masyarakat memperoleh layanan yang cepat, mudah, transparan, dan akuntabel. "
+) * 3
+JUDUL = ["SIGAP Ibu Hamil", "SIGAP Balita", "Posyandu Digital", "Apotek Keliling", "Jemput Bola Imunisasi", "Klinik Sanitasi Online"]
+
+
+def data_uji() -> pd.DataFrame:
+    rows = [{"Judul Inovasi": j, "Admin OPD": "Dinas Kesehatan", "Deskripsi": BOILERPLATE} for j in JUDUL]
+    # Pengajuan ulang yang hanya beda kapital/spasi/tanda baca
+    rows.append({"Judul Inovasi": "posyandu  DIGITAL", "Admin OPD": "Dinas Kesehatan", "Deskripsi": BOILERPLATE})
+    rows.append({"Judul Inovasi": "Apotek Keliling.", "Admin OPD": "dinas kesehatan", "Deskripsi": BOILERPLATE.upper()})
+    return pd.DataFrame(rows)
+
+
+def test_judul_berbeda_tidak_digabung():
+    df = data_uji()
+    labels = dashboard.near_duplicate_clusters(df)
+
+    assert np.unique(labels[:len(JUDUL)]).size == len(JUDUL)
+    assert labels[len(JUDUL)] == labels[JUDUL.index("Posyandu Digital")]
+    assert labels[len(JUDUL) + 1] == labels[JUDUL.index("Apotek Keliling")]
+    assert dashboard.collapse_near_duplicates(df, labels)["Judul Inovasi"].tolist() == JUDUL
+
+
+def test_anggota_mirip_langsung_dengan_pemimpin():
+    df = pd.concat([data_uji()] * 20, ignore_index=True)
+    df["Judul Inovasi"] += pd.Series(np.arange(len(df)) % 3).map({0: "", 1: " ", 2: "!"})
+    labels = dashboard.near_duplicate_clusters(df)
+
+    sig = dashboard.column_signatures(df["Judul Inovasi"])[0]
+    anggota = np.flatnonzero(labels != np.arange(len(df)))
+    assert len(anggota) > 0
+    # Tiap anggota dibandingkan langsung dengan baris pertama klasternya, bukan lewat rantai
+    assert (labels[labels[anggota]] == labels[anggota]).all()
+    assert ((sig[anggota] == sig[labels[anggota]]).mean(axis=1) >= dashboard.NEAR_DUP_TITLE_THRESHOLD).all()
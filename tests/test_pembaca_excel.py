@@ -0,0 +1,47 @@
+"""Pembaca workbook streaming dibandingkan dengan pd.read_excel."""
+import re
+import zipfile
+from io import BytesIO
+from typing import Optional
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from pembaca_excel import read_workbook
+
+BARIS = 800
+KOLOM = 15
+
+
+def workbook_bytes(dimensi: Optional[str] = None) -> bytes:
+    """Workbook satu sheet BARIS x KOLOM; jika `dimensi` diisi, tag <dimension> sheet ditimpa."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append([f"Kolom {j}" for j in range(KOLOM)])
+    for i in range(BARIS):
+        ws.append([f"teks {i}-{j}" if j % 2 else i * KOLOM + j for j in range(KOLOM)])
+    buf = BytesIO()
+    wb.save(buf)
+    if dimensi is None:
+        return buf.getvalue()
+
+    keluar = BytesIO()
+    with zipfile.ZipFile(BytesIO(buf.getvalue())) as src, zipfile.ZipFile(keluar, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data, n = re.subn(rb'<dimension ref="[^"]*"', f'<dimension ref="{dimensi}"'.encode(), data)
+                assert n == 1
+            dst.writestr(item, data)
+    return keluar.getvalue()
+
+
+@pytest.mark.parametrize("dimensi", [None, "A1"])
+def test_sama_dengan_read_excel(dimensi):
+    raw = workbook_bytes(dimensi)
+    harapan = pd.read_excel(BytesIO(raw))
+    hasil = read_workbook(raw)
+
+    assert hasil.shape == (BARIS, KOLOM)
+    pd.testing.assert_frame_equal(hasil, harapan)
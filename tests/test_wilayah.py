@@ -0,0 +1,23 @@
+"""Penyamaan nama wilayah dari file batas dengan ejaan gazetteer map_jatim.csv."""
+import numpy as np
+import pytest
+
+import dashboard_inovasi_final_fix as dashboard
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return dashboard.load_map_data()
+
+
+@pytest.mark.parametrize("nama, level, harapan", [
+    ("Kota Kediri", "kabupaten", "KotaKediri"),
+    ("KABUPATEN KEDIRI", "kabupaten", "Kediri"),
+    ("Kab. Mojokerto", "kabupaten", "Mojokerto"),
+    ("Kota Surabaya", "kabupaten", "Surabaya"),
+    ("Kota Batu", "kabupaten", "KotaBatu"),
+    ("Kec. Kabat", "kecamatan", "Kabat"),
+    ("Kecamatan Suko Manunggal", "kecamatan", "SukoManunggal"),
+])
+def test_region_labels(gazetteer, nama, level, harapan):
+    assert dashboard.region_labels(np.array([nama, None], dtype=object), gazetteer[level]).tolist() == [harapan, None]